@@ -1,6 +1,7 @@
 """Agent factories."""
 from __future__ import annotations
 
+import functools
 from typing import Tuple
 
 from agents import Agent, ModelSettings
@@ -9,55 +10,70 @@ from .config import PrototypeSettings
 from .guardrails import ensure_actionable_response, enforce_scope_guardrail
 from .tools import (
     get_recent_learnings,
-    log_agent_output,
-    log_synthesised_learning,
-    log_user_request,
+    log_batch,
 )
 
+TASK_AGENT_INSTRUCTIONS = (
+    "You are the Hack092725 Task Agent."
+    " Work with human users on software and learning tasks."
+    " Always check recent learnings via the provided tool before responding."
+    " Explain your reasoning and finish with a 'Next steps' section tailored to the user."
+    " Keep tone collaborative and precise."
+)
 
-def build_task_agent(settings: PrototypeSettings) -> Agent:
-    """Create the user-facing task agent."""
+KNOWLEDGE_EXCHANGE_INSTRUCTIONS = (
+    "You are the Hack092725 Knowledge Exchange agent."
+    " The orchestrator logs the user request and the Task Agent output itself."
+    " Your goal: synthesise a concise learning entry capturing what changed."
+    " Persist it with a single log_batch call."
+    " When synthesising, focus on reusable insights, constraints, and decisions."
+    " Confirm completion with a short checklist."
+)
 
-    instructions = (
-        "You are the Hack092725 Task Agent."
-        " Work with human users on software and learning tasks."
-        " Always check recent learnings via the provided tool before responding."
-        " Explain your reasoning and finish with a 'Next steps' section tailored to the user."
-        " Keep tone collaborative and precise."
-    )
 
+# The SDK only reads ModelSettings (resolve() returns a new instance), so both
+# agents share one default.
+_DEFAULT_MODEL_SETTINGS = ModelSettings()
+
+
+# Agents are immutable run configuration, so one instance per model is reused
+# by every orchestrator (API, CLI) in the process.
+@functools.lru_cache(maxsize=None)
+def _task_agent_for_model(model: str) -> Agent:
     return Agent(
         name="Task Agent",
-        instructions=instructions,
-        model=settings.default_model,
+        instructions=TASK_AGENT_INSTRUCTIONS,
+        model=model,
         tools=[get_recent_learnings],
-        model_settings=ModelSettings(),
+        model_settings=_DEFAULT_MODEL_SETTINGS,
         input_guardrails=[enforce_scope_guardrail],
         output_guardrails=[ensure_actionable_response],
     )
 
 
-def build_knowledge_exchange_agent(settings: PrototypeSettings) -> Agent:
-    """Create the Knowledge Exchange agent responsible for logging and synthesis."""
-
-    instructions = (
-        "You are the Hack092725 Knowledge Exchange agent."
-        " Your goals: (1) log the latest user request, (2) log the Task Agent output,"
-        " (3) synthesise a concise learning entry capturing what changed."
-        " Use the logging tools to persist each item."
-        " When synthesising, focus on reusable insights, constraints, and decisions."
-        " Confirm completion with a short checklist."
-    )
-
+@functools.lru_cache(maxsize=None)
+def _knowledge_exchange_agent_for_model(model: str) -> Agent:
     return Agent(
         name="Knowledge Exchange Agent",
-        instructions=instructions,
-        model=settings.default_model,
-        tools=[log_user_request, log_agent_output, log_synthesised_learning],
-        model_settings=ModelSettings(),
+        instructions=KNOWLEDGE_EXCHANGE_INSTRUCTIONS,
+        model=model,
+        tools=[log_batch],
+        model_settings=_DEFAULT_MODEL_SETTINGS,
     )
 
 
+def build_task_agent(settings: PrototypeSettings) -> Agent:
+    """Create the user-facing task agent."""
+
+    return _task_agent_for_model(settings.default_model)
+
+
+def build_knowledge_exchange_agent(settings: PrototypeSettings) -> Agent:
+    """Create the Knowledge Exchange agent responsible for logging and synthesis."""
+
+    return _knowledge_exchange_agent_for_model(settings.default_model)
+
+
 def build_agents(settings: PrototypeSettings) -> Tuple[Agent, Agent]:
     return build_task_agent(settings), build_knowledge_exchange_agent(settings)
 
@@ -85,7 +85,7 @@ async def build_plan(request: PlanRequest) -> PlanResponse:
         request.session_id,
         request.question,
     )
-    return PlanResponse(plan_markdown=preview.plan_result.final_output, digest=preview.digest)
+    return PlanResponse.model_construct(plan_markdown=preview.plan_result.final_output, digest=preview.digest)
 
 
 @app.post("/run", response_model=RunResponse)
@@ -128,7 +128,7 @@ async def run_agents(request: RunRequest) -> RunResponse:
 
     augmentation_payload = None
     if result.augmentation is not None:
-        augmentation_payload = AugmentationPayload(
+        augmentation_payload = AugmentationPayload.model_construct(
             original=result.augmentation.original,
             suggestion=result.augmentation.suggestion,
             final_prompt=result.augmentation.final_prompt,
@@ -138,7 +138,8 @@ async def run_agents(request: RunRequest) -> RunResponse:
             raw_model_response=result.augmentation.raw_model_response,
         )
 
-    return RunResponse(
+    # Fields are already typed; FastAPI validates once against ``response_model``.
+    return RunResponse.model_construct(
         final_output=result.task_result.final_output,
         guardrail_feedback=guardrail_messages,
         knowledge_exchange_summary=ke_summary,
@@ -152,13 +153,13 @@ async def run_agents(request: RunRequest) -> RunResponse:
 async def list_sessions(limit: int = 20) -> List[SessionSummary]:
     snapshots: List[SessionSnapshot] = _knowledge_store.list_sessions(limit=limit)
     return [
-        SessionSummary(
+        SessionSummary.model_construct(
             session_id=snapshot.session_id,
             updated_at=snapshot.updated_at.isoformat(),
             digest=snapshot.digest,
             recent=[
-                SessionSummaryItem(kind=item.kind, summary=item.summary)
-                for item in snapshot.recent
+                SessionSummaryItem.model_construct(kind=kind, summary=summary)
+                for kind, summary in zip(snapshot.recent_kinds, snapshot.recent_summaries)
             ],
         )
         for snapshot in snapshots
@@ -4,14 +4,14 @@ from __future__ import annotations
 import asyncio
 import datetime as dt
 import difflib
-import functools
-import json
-import re
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import List, Optional, Sequence, Tuple
 
-from openai import OpenAI  # type: ignore
+import orjson
+from openai import AsyncOpenAI, OpenAI  # type: ignore
 
 from .knowledge_store import KnowledgeStore
 
@@ -25,6 +25,26 @@ class SessionRecap:
     summary_markdown: Optional[str]
     turn_log_tail: List[str]
     recent_user_queries: List[str]
+    _context_blob: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def context_blob(self) -> str:
+        """Return the recap rendered as augmentation context, composing it once.
+
+        Recaps are cached per store version, so the plan and run phases of a
+        turn share the rendered string.
+        """
+
+        if self._context_blob is None:
+            sections: List[str] = []
+            if self.summary_markdown:
+                sections.append(f"Summary of previous session:\n{self.summary_markdown}")
+            if self.turn_log_tail:
+                sections.append("Recent turn log entries:\n" + "\n".join(self.turn_log_tail))
+            if self.recent_user_queries:
+                queries = "\n".join(f"- {q}" for q in self.recent_user_queries)
+                sections.append(f"Recent direct user questions:\n{queries}")
+            self._context_blob = "\n\n".join(sections) or "(No additional context)"
+        return self._context_blob
 
 
 @dataclass(slots=True)
@@ -39,6 +59,9 @@ class AugmentationResult:
 def diff_prompts(original: str, rewritten: str) -> str:
     """Return a unified diff between the original and rewritten prompts."""
 
+    if original == rewritten:
+        return ""
+
     diff = difflib.unified_diff(
         original.splitlines(),
         rewritten.splitlines(),
@@ -52,46 +75,52 @@ def diff_prompts(original: str, rewritten: str) -> str:
     return "\n".join(diff_lines[2:])
 
 
-def _normalise_json_text(text: str) -> Optional[dict]:
-    stripped = text.strip()
-    if stripped.startswith("```"):
-        stripped = "\n".join(
-            line for line in stripped.splitlines() if not line.startswith("```")
-        ).strip()
-    match = re.search(r"\{.*\}", stripped, flags=re.DOTALL)
-    if not match:
-        return None
-    try:
-        return json.loads(match.group(0))
-    except json.JSONDecodeError:
-        return None
-
-
 def _render_summary_block(entries: List[str]) -> Optional[str]:
-    combined = "\n\n".join(item.strip() for item in entries if item.strip())
-    return combined or None
+    parts = [stripped for stripped in (item.strip() for item in entries) if stripped]
+    return "\n\n".join(parts) or None
 
 
 def load_session_recap(store: KnowledgeStore, session_id: str) -> Optional[SessionRecap]:
-    """Assemble a recap from the flat-file knowledge store."""
+    """Assemble a recap from the flat-file knowledge store.
+
+    Results are reused until the store logs another entry for the session, so
+    the plan and run phases of a learn-mode turn share one recap.
+    """
+
+    version = store.version(session_id)
+    # Kept on the store so cached recaps are released with it.
+    recap_cache = store._recap_cache  # noqa: SLF001 - cache owned by the store
+    cached = recap_cache.get(session_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    recap = _build_session_recap(store, session_id)
+    recap_cache[session_id] = (version, recap)
+    return recap
+
+
+def _build_session_recap(store: KnowledgeStore, session_id: str) -> Optional[SessionRecap]:
 
-    summary_entries = store.entries(session_id, kind="synthesised_learnings", limit=3)
-    turn_entries = store.entries(session_id, limit=8)
-    user_entries = store.entries(session_id, kind="user_actions", limit=5)
+    buckets = store.entries_multi(
+        session_id,
+        {"synthesised_learnings": 3, None: 8, "user_actions": 5},
+        newest_first=False,
+    )
+    summary_entries = buckets["synthesised_learnings"]
+    turn_entries = buckets[None]
+    user_entries = buckets["user_actions"]
 
     if not summary_entries and not turn_entries and not user_entries:
         return None
 
-    summary_markdown = _render_summary_block([entry.content for entry in reversed(summary_entries)])
+    summary_markdown = _render_summary_block([entry.content for entry in summary_entries])
 
     turn_log_tail = []
-    for entry in reversed(turn_entries):
-        snippet = entry.content.strip().splitlines()
-        headline = snippet[0] if snippet else "(no content)"
+    for entry in turn_entries:
+        headline = entry.content.strip().partition("\n")[0].rstrip() or "(no content)"
         turn_log_tail.append(f"- [{entry.kind}] {headline}")
 
     recent_user_queries = [
-        entry.content.strip() for entry in reversed(user_entries) if entry.content.strip()
+        query for query in (entry.content.strip() for entry in user_entries) if query
     ]
 
     documents_dir = store._session_dir(session_id)  # noqa: SLF001 - internal helper reused for compatibility
@@ -106,6 +135,7 @@ def load_session_recap(store: KnowledgeStore, session_id: str) -> Optional[Sessi
 
 
 _CLIENT: Optional[OpenAI] = None
+_ASYNC_CLIENT: Optional[AsyncOpenAI] = None
 
 
 def _get_client() -> OpenAI:
@@ -115,76 +145,155 @@ def _get_client() -> OpenAI:
     return _CLIENT
 
 
-def _generate_augmented_prompt_sync(
-    original: str,
-    recap: Optional[SessionRecap],
-    *,
-    model: str,
-) -> AugmentationResult:
-    """Use GPT to rewrite the user message with prior learnings."""
+def _get_async_client() -> AsyncOpenAI:
+    global _ASYNC_CLIENT
+    if _ASYNC_CLIENT is None:
+        _ASYNC_CLIENT = AsyncOpenAI()
+    return _ASYNC_CLIENT
+
+
+_AUGMENTATION_TEXT_FORMAT = {
+    "format": {
+        "type": "json_schema",
+        "name": "augmented_prompt",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "rewritten_prompt": {"type": "string"},
+                "justification": {"type": "array", "items": {"type": "string"}},
+            },
+            "required": ["rewritten_prompt", "justification"],
+            "additionalProperties": False,
+        },
+    }
+}
 
-    if not original.strip():
-        return AugmentationResult(original, ["No content provided"], raw_text="")
+_AUGMENTATION_SYSTEM_PROMPT = (
+    "You are the Knowledge Exchange agent. Improve the user's request so the task agent "
+    "benefits from lessons learned in prior sessions. Use the context below to add reminders, "
+    "clarify intent, or highlight prior solutions."
+)
 
-    context_sections: List[str] = []
-    if recap:
-        if recap.summary_markdown:
-            context_sections.append(f"Summary of previous session:\n{recap.summary_markdown}")
-        if recap.turn_log_tail:
-            context_sections.append(
-                "Recent turn log entries:\n" + "\n".join(recap.turn_log_tail)
-            )
-        if recap.recent_user_queries:
-            queries = "\n".join(f"- {q}" for q in recap.recent_user_queries)
-            context_sections.append(f"Recent direct user questions:\n{queries}")
 
-    context_blob = "\n\n".join(context_sections) if context_sections else "(No additional context)"
+def _build_augmentation_request(original: str, recap: Optional[SessionRecap], *, model: str) -> dict:
+    """Return Responses API keyword arguments for an augmentation request.
 
-    prompt_user = (
-        "You are the Knowledge Exchange agent. Improve the user's request so the task agent "
-        "benefits from lessons learned in prior sessions. Use the context below to add reminders, "
-        "clarify intent, or highlight prior solutions."
-    )
+    The session context precedes the user's request so consecutive turns in a
+    session share a byte-identical prompt prefix the provider can cache.
+    """
+
+    context_blob = recap.context_blob() if recap else "(No additional context)"
 
     user_message = (
-        f"Original user request:\n```\n{original}\n```\n\n"
         f"Context for augmentation:\n```\n{context_blob}\n```\n\n"
-        "Respond with JSON containing `rewritten_prompt` (string) and `justification` (array of short bullet strings)."
+        "Respond with JSON containing `rewritten_prompt` (string) and `justification` (array of short bullet strings).\n\n"
+        f"Original user request:\n```\n{original}\n```"
     )
 
-    try:
-        client = _get_client()
-        response = client.responses.create(
-            model=model,
-            input=[
-                {"role": "system", "content": prompt_user},
-                {"role": "user", "content": user_message},
-            ],
-        )
-        raw_text = response.output_text
-    except Exception as exc:  # pragma: no cover - rely on runtime behaviour
-        return AugmentationResult(original, [f"Augmentation failed: {exc}"], raw_text="")
+    request: dict = {
+        "model": model,
+        "text": _AUGMENTATION_TEXT_FORMAT,
+        "input": [
+            {"role": "system", "content": _AUGMENTATION_SYSTEM_PROMPT},
+            {"role": "user", "content": user_message},
+        ],
+    }
+    if recap:
+        request["prompt_cache_key"] = recap.session_id
+    return request
+
+
+def _parse_augmentation_response(original: str, raw_text: str) -> Tuple[AugmentationResult, bool]:
+    """Turn the model's raw text into an ``AugmentationResult``.
 
-    parsed = _normalise_json_text(raw_text)
-    if not parsed:
-        return AugmentationResult(original, ["Model response was not valid JSON"], raw_text=raw_text)
+    The flag is ``True`` only when the model supplied a usable rewrite.
+    """
+
+    try:
+        parsed = orjson.loads(raw_text)
+    except orjson.JSONDecodeError:
+        parsed = None
+    if not isinstance(parsed, dict):
+        return AugmentationResult(original, ["Model response was not valid JSON"], raw_text=raw_text), False
 
     rewritten = parsed.get("rewritten_prompt")
     if not isinstance(rewritten, str) or not rewritten.strip():
-        return AugmentationResult(original, ["Model did not provide a rewritten prompt"], raw_text=raw_text)
+        return AugmentationResult(original, ["Model did not provide a rewritten prompt"], raw_text=raw_text), False
 
     justification_raw = parsed.get("justification", [])
     if isinstance(justification_raw, str):
         justification = [justification_raw]
-    elif isinstance(justification_raw, Iterable):
-        justification = [str(item) for item in justification_raw if str(item).strip()]
+    elif isinstance(justification_raw, (list, tuple)):
+        justification = [text for item in justification_raw if (text := str(item)).strip()]
     else:
         justification = []
 
     if not justification:
         justification = ["Model did not provide justification"]
 
-    return AugmentationResult(rewritten.strip(), justification, raw_text=raw_text)
+    return AugmentationResult(rewritten.strip(), justification, raw_text=raw_text), True
+
+
+# Re-asking a question against unchanged session context reuses the earlier
+# rewrite instead of another model call.
+_AUGMENTATION_CACHE_SIZE = 128
+_AUGMENTATION_CACHE: OrderedDict[tuple[str, str, str], AugmentationResult] = OrderedDict()
+_AUGMENTATION_CACHE_LOCK = threading.Lock()
+
+
+def _augmentation_cache_key(original: str, recap: Optional[SessionRecap], model: str) -> tuple[str, str, str]:
+    # Whitespace differences do not change what is being asked. Case does:
+    # the cached rewrite carries the question's identifiers verbatim.
+    question = " ".join(original.split())
+    return model, recap.context_blob() if recap else "", question
+
+
+def _cached_augmentation(key: tuple[str, str, str]) -> Optional[AugmentationResult]:
+    with _AUGMENTATION_CACHE_LOCK:
+        result = _AUGMENTATION_CACHE.get(key)
+        if result is not None:
+            _AUGMENTATION_CACHE.move_to_end(key)
+        return result
+
+
+def _remember_augmentation(key: tuple[str, str, str], result: AugmentationResult) -> None:
+    with _AUGMENTATION_CACHE_LOCK:
+        _AUGMENTATION_CACHE[key] = result
+        _AUGMENTATION_CACHE.move_to_end(key)
+        if len(_AUGMENTATION_CACHE) > _AUGMENTATION_CACHE_SIZE:
+            _AUGMENTATION_CACHE.popitem(last=False)
+
+
+def _generate_augmented_prompt_sync(
+    original: str,
+    recap: Optional[SessionRecap],
+    *,
+    model: str,
+) -> AugmentationResult:
+    """Use GPT to rewrite the user message with prior learnings."""
+
+    if not original.strip():
+        return AugmentationResult(original, ["No content provided"], raw_text="")
+
+    cache_key = _augmentation_cache_key(original, recap, model)
+    cached = _cached_augmentation(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        response = _get_client().responses.create(
+            **_build_augmentation_request(original, recap, model=model)
+        )
+        raw_text = response.output_text
+    except Exception as exc:  # pragma: no cover - rely on runtime behaviour
+        return AugmentationResult(original, [f"Augmentation failed: {exc}"], raw_text="")
+
+    result, parsed = _parse_augmentation_response(original, raw_text)
+    if parsed:
+        # Failures are not cached so the next request retries.
+        _remember_augmentation(cache_key, result)
+    return result
 
 
 def generate_augmented_prompt(
@@ -203,16 +312,117 @@ async def generate_augmented_prompt_async(
     recap: Optional[SessionRecap],
     *,
     model: str,
+    client: Optional[AsyncOpenAI] = None,
 ) -> AugmentationResult:
-    """Async wrapper that executes augmentation in a thread pool."""
+    """Rewrite the user message using ``client`` or the shared async OpenAI client."""
+
+    if not original.strip():
+        return AugmentationResult(original, ["No content provided"], raw_text="")
+
+    cache_key = _augmentation_cache_key(original, recap, model)
+    cached = _cached_augmentation(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        response = await (client or _get_async_client()).responses.create(
+            **_build_augmentation_request(original, recap, model=model)
+        )
+        raw_text = response.output_text
+    except Exception as exc:  # pragma: no cover - rely on runtime behaviour
+        return AugmentationResult(original, [f"Augmentation failed: {exc}"], raw_text="")
+
+    result, parsed = _parse_augmentation_response(original, raw_text)
+    if parsed:
+        # Failures are not cached so the next request retries.
+        _remember_augmentation(cache_key, result)
+    return result
 
-    loop = asyncio.get_running_loop()
-    func = functools.partial(_generate_augmented_prompt_sync, original, recap, model=model)
-    return await loop.run_in_executor(None, func)
+
+_MAX_CONCURRENT_AUGMENTATIONS = 8
+
+
+async def generate_augmented_prompts_async(
+    items: Sequence[Tuple[str, Optional[SessionRecap]]],
+    *,
+    model: str,
+    max_concurrency: int = _MAX_CONCURRENT_AUGMENTATIONS,
+    client: Optional[AsyncOpenAI] = None,
+) -> List[AugmentationResult]:
+    """Rewrite several ``(original, recap)`` pairs concurrently, preserving order."""
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _generate(original: str, recap: Optional[SessionRecap]) -> AugmentationResult:
+        async with semaphore:
+            return await generate_augmented_prompt_async(original, recap, model=model, client=client)
+
+    return list(await asyncio.gather(*(_generate(original, recap) for original, recap in items)))
+
+
+def generate_augmented_prompts(
+    items: Sequence[Tuple[str, Optional[SessionRecap]]],
+    *,
+    model: str,
+    max_concurrency: int = _MAX_CONCURRENT_AUGMENTATIONS,
+) -> List[AugmentationResult]:
+    """Synchronous wrapper around ``generate_augmented_prompts_async`` for batch jobs."""
+
+    async def _run() -> List[AugmentationResult]:
+        # The shared async client's connection pool is bound to the first
+        # event loop it runs on, and ``asyncio.run`` starts a new loop per call.
+        client = AsyncOpenAI()
+        try:
+            return await generate_augmented_prompts_async(
+                items, model=model, max_concurrency=max_concurrency, client=client
+            )
+        finally:
+            await client.close()
+
+    return asyncio.run(_run())
+
+
+_AUGMENTED_TURN_TEMPLATE = """\
+## Turn {turn} — {timestamp}
+
+**Original**
+```
+{original}
+```
+
+**Suggested Augmentation**
+```
+{suggestion}
+```
+
+**Final Prompt Sent**
+```
+{final_prompt}
+```
+
+**Diff (original vs. suggestion)**
+```diff
+{suggestion_diff}
+```
+
+{final_diff_block}**Why it changed**
+{reasons}
+
+**Human accepted augmentation?**
+- {accepted}
+"""
+
+_FINAL_DIFF_TEMPLATE = """\
+**Diff (original vs. final prompt)**
+```diff
+{final_diff}
+```
+
+"""
 
 
 def _count_entries(store: KnowledgeStore, session_id: str, kind: str) -> int:
-    return sum(1 for entry in store.iter_all(session_id) if entry.kind == kind)
+    return store.count(session_id, kind)
 
 
 def log_augmented_turn(
@@ -227,57 +437,38 @@ def log_augmented_turn(
     justification: List[str] | None = None,
     accepted: bool = True,
 ) -> None:
-    """Persist augmented prompt details for human review."""
+    """Persist augmented prompt details for human review.
+
+    Accepted turns where neither the suggestion nor the final prompt changed
+    the original are skipped; there is nothing to review.
+    """
+
+    if (
+        accepted
+        and not suggestion_diff.strip()
+        and not final_diff.strip()
+        and suggestion.strip() == original.strip()
+    ):
+        return
 
     turn_index = _count_entries(store, session_id, "augmented_turns") + 1
     timestamp = dt.datetime.utcnow().isoformat()
 
-    lines = [
-        f"## Turn {turn_index} — {timestamp}",
-        "",
-        "**Original**",
-        "```",
-        (original.strip() or "(empty)"),
-        "```",
-        "",
-        "**Suggested Augmentation**",
-        "```",
-        (suggestion.strip() or "(empty)"),
-        "```",
-        "",
-        "**Final Prompt Sent**",
-        "```",
-        (final_prompt.strip() or "(empty)"),
-        "```",
-        "",
-        "**Diff (original vs. suggestion)**",
-        "```diff",
-        (suggestion_diff.strip() or "(no diff)"),
-        "```",
-        "",
-    ]
-
+    final_diff_block = ""
     if final_prompt.strip() != suggestion.strip():
-        lines.extend(
-            [
-                "**Diff (original vs. final prompt)**",
-                "```diff",
-                (final_diff.strip() or "(no diff)"),
-                "```",
-                "",
-            ]
-        )
-
-    reasons = [f"- {item}" for item in (justification or [])] or ["- (not provided)"]
-    lines.extend(
-        [
-            "**Why it changed**",
-            *reasons,
-            "",
-            "**Human accepted augmentation?**",
-            f"- {'Yes' if accepted else 'No'}",
-            "",
-        ]
+        final_diff_block = _FINAL_DIFF_TEMPLATE.format(final_diff=final_diff.strip() or "(no diff)")
+
+    reasons = "\n".join(f"- {item}" for item in (justification or [])) or "- (not provided)"
+    content = _AUGMENTED_TURN_TEMPLATE.format(
+        turn=turn_index,
+        timestamp=timestamp,
+        original=original.strip() or "(empty)",
+        suggestion=suggestion.strip() or "(empty)",
+        final_prompt=final_prompt.strip() or "(empty)",
+        suggestion_diff=suggestion_diff.strip() or "(no diff)",
+        final_diff_block=final_diff_block,
+        reasons=reasons,
+        accepted="Yes" if accepted else "No",
     )
 
     metadata = {
@@ -300,7 +491,7 @@ def log_augmented_turn(
     store.log(
         session_id=session_id,
         kind="augmented_turns",
-        content="\n".join(lines),
+        content=content,
         metadata=metadata,
     )
 
@@ -311,6 +502,8 @@ __all__ = [
     "diff_prompts",
     "generate_augmented_prompt",
     "generate_augmented_prompt_async",
+    "generate_augmented_prompts",
+    "generate_augmented_prompts_async",
     "load_session_recap",
     "log_augmented_turn",
 ]
@@ -6,10 +6,10 @@ import asyncio
 import sys
 from typing import Optional
 
-from .config import load_settings
 from .knowledge_store import KnowledgeStore
-from .orchestrator import PrototypeOrchestrator
-from .session import SessionManager
+
+_CANCEL_REPLIES = frozenset({"n", "no", "cancel"})
+_PROCEED_REPLIES = frozenset({"y", "yes", ""})
 
 
 def _build_parser() -> argparse.ArgumentParser:
@@ -33,7 +33,24 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
+def _prompt(message: str) -> str:
+    """Read one line from stdin after writing ``message``, like ``input()`` without its extra flushes."""
+
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
 async def _async_main(question: Optional[str], session_id: str, learn_mode: bool, skip_synthesis: bool) -> int:
+    # These pull in the Agents SDK (over a second to import), so `--help` and
+    # argument errors skip them.
+    from .config import load_settings
+    from .orchestrator import PrototypeOrchestrator
+    from .session import SessionManager
+
     settings = load_settings()
     if not settings.has_api_key:
         print("[warning] OPENAI_API_KEY is not set. The agents will fail to call models.", file=sys.stderr)
@@ -44,23 +61,25 @@ async def _async_main(question: Optional[str], session_id: str, learn_mode: bool
 
     if not question:
         try:
-            question = input("Enter your question/task: ").strip()
+            question = _prompt("Enter your question/task: ").strip()
         except EOFError:
             print("No question provided.", file=sys.stderr)
             return 1
 
     plan_preview = None
     if learn_mode:
-        plan_preview = await orchestrator.build_learn_mode_plan(session_id, question)
-        print("\n--- Prior solution recap ---")
-        print(plan_preview.plan_result.final_output)
-        decision = input("Proceed with execution? (y to run / n to cancel / or add new instructions): ").strip()
+        # The CLI discards the prefetch on cancel, so it can start the
+        # augmentation alongside the plan call.
+        plan_preview = await orchestrator.build_learn_mode_plan(session_id, question, prefetch_augmentation=True)
+        sys.stdout.write(f"\n--- Prior solution recap ---\n{plan_preview.plan_result.final_output}\n")
+        decision = _prompt("Proceed with execution? (y to run / n to cancel / or add new instructions): ").strip()
         lowered = decision.lower()
-        if lowered in {"n", "no", "cancel"}:
+        if lowered in _CANCEL_REPLIES:
             print("Aborting run at user request.")
+            orchestrator.discard_prefetch(session_id)
             await session_manager.close_all()
             return 0
-        if lowered not in {"y", "yes", ""}:
+        if lowered not in _PROCEED_REPLIES:
             question = f"{question}\n\nAdditional guidance from user: {decision}"
 
     try:
@@ -73,27 +92,30 @@ async def _async_main(question: Optional[str], session_id: str, learn_mode: bool
     finally:
         await session_manager.close_all()
 
-    print("\n=== Task Agent Output ===")
-    print(run.task_result.final_output)
+    # Assemble the report and emit it with a single write.
+    parts = ["", "=== Task Agent Output ===", str(run.task_result.final_output)]
 
     if run.task_result.output_guardrail_results:
-        print("\n[guardrail] Output guardrail feedback:")
+        parts += ["", "[guardrail] Output guardrail feedback:"]
         for result in run.task_result.output_guardrail_results:
             info = getattr(getattr(result, 'output', None), 'output_info', None)
             if info:
-                print(f"- {info}")
+                parts.append(f"- {info}")
 
     if run.knowledge_exchange_result is not None:
-        print("\n=== Knowledge Exchange Summary ===")
-        print(run.knowledge_exchange_result.final_output)
+        parts += ["", "=== Knowledge Exchange Summary ===", str(run.knowledge_exchange_result.final_output)]
 
     usage = run.task_result.context_wrapper.usage if run.task_result.context_wrapper else None
     if usage:
-        print("\n[usage stats]")
-        print(f"Requests: {usage.requests}")
-        print(f"Input tokens: {usage.input_tokens}, Output tokens: {usage.output_tokens}")
+        parts += [
+            "",
+            "[usage stats]",
+            f"Requests: {usage.requests}",
+            f"Input tokens: {usage.input_tokens}, Output tokens: {usage.output_tokens}",
+        ]
 
-    print("\nDocuments stored in:", settings.data_root)
+    parts += ["", f"Documents stored in: {settings.data_root}"]
+    sys.stdout.write("\n".join(parts) + "\n")
 
     return 0
 
@@ -101,6 +123,9 @@ async def _async_main(question: Optional[str], session_id: str, learn_mode: bool
 def main(argv: Optional[list[str]] = None) -> int:
     parser = _build_parser()
     args = parser.parse_args(argv)
+    # Flush each line as it is printed, even when stdout is piped (e.g. to tee).
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=True)
 
     return asyncio.run(
         _async_main(
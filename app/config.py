@@ -1,13 +1,12 @@
 """Configuration helpers for the Hack092725 Agents prototype."""
 from __future__ import annotations
 
+import functools
 import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
 
-from dotenv import load_dotenv
-
 from agents import set_tracing_disabled
 
 
@@ -26,20 +25,29 @@ class PrototypeSettings:
         return bool(self.openai_api_key)
 
 
+@functools.lru_cache(maxsize=1)
 def load_settings(env_path: Optional[Path] = None) -> PrototypeSettings:
-    """Load settings from the environment (optionally using a .env file)."""
+    """Load settings from the environment (optionally using a .env file).
+
+    The result is cached per process; call ``load_settings.cache_clear()`` to
+    pick up environment changes.
+    """
 
     if env_path is None:
         # Honour a top-level .env if present; otherwise rely on process env vars.
         env_path = Path(".env")
     if env_path.exists():
+        # Imported here so processes without a .env file never load python-dotenv.
+        from dotenv import load_dotenv
+
         load_dotenv(env_path)
 
     if os.getenv("HACK092725_ENABLE_TRACING") != "1":
         set_tracing_disabled(True)
 
     root = Path(os.getenv("HACK092725_DATA_ROOT", "documents")).resolve()
-    root.mkdir(parents=True, exist_ok=True)
+    if not root.exists():
+        root.mkdir(parents=True, exist_ok=True)
 
     session_db = root / "sessions.sqlite"
 
@@ -1,6 +1,8 @@
 """Guardrails applied to the Task agent."""
 from __future__ import annotations
 
+import itertools
+import re
 from typing import Iterable, List
 
 from agents import (
@@ -17,19 +19,26 @@ from .session import PrototypeContext
 def _extract_text(input_payload: str | List[TResponseInputItem]) -> str:
     if isinstance(input_payload, str):
         return input_payload
-    fragments: List[str] = []
-    for item in input_payload:
-        if isinstance(item, dict):
-            role = item.get("role")
-            if role == "user":
-                contents = item.get("content", [])
-                for content in contents:
-                    if isinstance(content, dict) and content.get("type") == "input_text":
-                        fragments.append(content.get("text", ""))
-    return "\n".join(fragments)
+    return "\n".join(
+        content.get("text", "")
+        for item in input_payload
+        if isinstance(item, dict) and item.get("role") == "user"
+        for content in item.get("content", ())
+        if isinstance(content, dict) and content.get("type") == "input_text"
+    )
 
 
 BANNED_TOPICS = {"weapon", "harm", "explosive", "malware"}
+_BANNED_TOPICS_RE = re.compile("|".join(re.escape(topic) for topic in sorted(BANNED_TOPICS)))
+
+_MIN_RESPONSE_WORDS = 10
+_WORD_RE = re.compile(r"\S+")
+_NEXT_STEPS_RE = re.compile("next steps", re.IGNORECASE)
+
+
+def _has_min_words(text: str, minimum: int) -> bool:
+    # Stop scanning once ``minimum`` words are seen instead of splitting the whole text.
+    return sum(1 for _ in itertools.islice(_WORD_RE.finditer(text), minimum)) >= minimum
 
 
 @input_guardrail
@@ -43,12 +52,12 @@ async def enforce_scope_guardrail(
     text = _extract_text(input).strip().lower()
     if not text:
         return GuardrailFunctionOutput(tripwire_triggered=False, output_info="Input missing; allowed to proceed.")
-    for topic in BANNED_TOPICS:
-        if topic in text:
-            return GuardrailFunctionOutput(
-                tripwire_triggered=False,
-                output_info=f"Input mentions '{topic}', monitor closely but allow.",
-            )
+    match = _BANNED_TOPICS_RE.search(text)
+    if match:
+        return GuardrailFunctionOutput(
+            tripwire_triggered=False,
+            output_info=f"Input mentions '{match.group(0)}', monitor closely but allow.",
+        )
     return GuardrailFunctionOutput(tripwire_triggered=False, output_info="Input accepted")
 
 
@@ -61,12 +70,12 @@ async def ensure_actionable_response(
     """Encourage responses that include explanations and next steps."""
 
     text = (output or "").strip()
-    if len(text.split()) < 10:
+    if not _has_min_words(text, _MIN_RESPONSE_WORDS):
         return GuardrailFunctionOutput(
             tripwire_triggered=True,
             output_info="Response too short to be useful. Expand the answer.",
         )
-    if "next steps" not in text.lower():
+    if not _NEXT_STEPS_RE.search(text):
         return GuardrailFunctionOutput(
             tripwire_triggered=False,
             output_info="Consider appending explicit next steps for the user.",
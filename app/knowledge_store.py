@@ -2,11 +2,59 @@
 from __future__ import annotations
 
 import datetime as dt
-import json
+import heapq
+import itertools
+import mmap
+import os
+import re
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, Optional
+
+import orjson
+
+# Maximum number of parsed entry files kept in memory per store.
+_FILE_CACHE_SIZE = 512
+
+# Entry files at least this large are parsed straight from a read-only mapping
+# instead of being copied into a bytes object first.
+_MMAP_THRESHOLD_BYTES = 64 * 1024
+
+# Digests only need ``kind`` and ``metadata.summary``; both precede the
+# (potentially large) ``content`` field, so a small prefix usually suffices.
+_HEADER_READ_BYTES = 4096
+_KIND_RE = re.compile(rb'"kind":\s*"((?:[^"\\]|\\.)*)"')
+_SUMMARY_RE = re.compile(rb'"summary":\s*"((?:[^"\\]|\\.)+)"')
+
+# Each session keeps an append-only index of ``{"file", "kind", "summary"}``
+# records so newest-first queries read the tail of one file instead of
+# globbing and parsing every entry.
+INDEX_FILENAME = "index.jsonl"
+_INDEX_CHUNK_BYTES = 8192
+
+# The default digest is rewritten on every ``log()`` so readers only need to
+# stat and read one small file.
+DIGEST_FILENAME = "digest.txt"
+_DIGEST_LIMIT = 3
+
+_LIST_SESSIONS_MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+# Entry files are named ``{timestamp}-{sequence}-{kind}[-suffix].md``; files
+# written before the sequence number was added omit it.
+_FILENAME_PREFIX_RE = re.compile(r"\d{8}-\d{6}-(?:\d{6}-)?")
+
+
+def _filename_has_kind(name: str, kind: str) -> bool:
+    """Return whether an entry filename encodes ``kind``."""
+
+    prefix = _FILENAME_PREFIX_RE.match(name)
+    rest = name[prefix.end():] if prefix else name
+    return rest.startswith(kind) and rest[len(kind):len(kind) + 1] in ("-", ".")
 
 
 @dataclass(slots=True)
@@ -18,18 +66,14 @@ class KnowledgeEntry:
     metadata: dict
 
 
-@dataclass(slots=True)
-class SessionSnapshotEntry:
-    kind: str
-    summary: str
-
-
 @dataclass(slots=True)
 class SessionSnapshot:
     session_id: str
     updated_at: dt.datetime
     digest: str
-    recent: List[SessionSnapshotEntry]
+    # Parallel tuples: ``recent_kinds[i]`` belongs to ``recent_summaries[i]``.
+    recent_kinds: tuple[str, ...]
+    recent_summaries: tuple[str, ...]
 
 
 class KnowledgeStore:
@@ -38,9 +82,28 @@ class KnowledgeStore:
     def __init__(self, root: Path) -> None:
         self.root = root
         self.root.mkdir(parents=True, exist_ok=True)
-        self._digest_cache: dict[str, str] = {}
-        self._entries_cache: dict[tuple[str, Optional[str], int], list[KnowledgeEntry]] = {}
-        self._session_cache: dict[str, SessionSnapshot] = {}
+        self._digest_cache: dict[str, tuple[int, int, str]] = {}
+        self._entries_cache: dict[str, dict[tuple[Optional[str], int], list[KnowledgeEntry]]] = {}
+        # Snapshots are reused while the session's newest mtime is unchanged,
+        # which also catches entries written by other processes.
+        self._session_cache: dict[str, tuple[int, SessionSnapshot]] = {}
+        self._kind_counts: dict[tuple[str, str], int] = {}
+        self._versions: dict[str, int] = {}
+        # Learn-mode recaps built by augmentation.load_session_recap, tagged
+        # with the version they were built at.
+        self._recap_cache: dict[str, tuple[int, object]] = {}
+        # Sessions whose directory and index this store has already ensured,
+        # so writes and index reads skip the mkdir/exists checks.
+        self._session_dirs: dict[str, Path] = {}
+        # Per-session sequence numbers keep same-second filenames unique.
+        self._session_counters: dict[str, itertools.count] = {}
+        self._timestamp: tuple[int, str] = (0, "")
+        self._file_cache: OrderedDict[Path, tuple[int, int, dict]] = OrderedDict()
+        # list_sessions reads sessions from worker threads.
+        self._file_cache_lock = threading.Lock()
+        # The orchestrator logs from worker threads; serialise index appends
+        # so digest.txt always reflects the newest entries.
+        self._log_lock = threading.Lock()
 
     def _session_dir(self, session_id: str) -> Path:
         return self.root / session_id
@@ -48,107 +111,397 @@ class KnowledgeStore:
     def log(self, session_id: str, kind: str, content: str, metadata: Optional[dict] = None) -> KnowledgeEntry:
         """Write a new entry and return the resulting record."""
 
-        session_dir = self._session_dir(session_id)
-        session_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = time.strftime("%Y%m%d-%H%M%S")
-        suffix = metadata.get("suffix") if metadata else None
-        filename = f"{timestamp}-{kind}{('-' + suffix) if suffix else ''}.md"
-        path = session_dir / filename
+        return self.log_many(session_id, [(kind, content, metadata)])[0]
+
+    def log_many(
+        self,
+        session_id: str,
+        items: Iterable[tuple[str, str, Optional[dict]]],
+    ) -> list[KnowledgeEntry]:
+        """Write several ``(kind, content, metadata)`` entries with one index append and digest update."""
+
+        session_dir = self._session_dirs.get(session_id) or self._create_session_dir(session_id)
+        counter = self._session_counters.setdefault(session_id, itertools.count())
+        timestamp = self._current_timestamp()
+
+        # Check every filename before writing so a bad item cannot leave
+        # earlier entries of the batch on disk without index records.
+        pending: list[tuple[str, str, dict, str]] = []
+        for kind, content, metadata in items:
+            metadata = metadata or {}
+            suffix = metadata.get("suffix")
+            tail = f"-{kind}{('-' + suffix) if suffix else ''}.md"
+            if "/" in tail or (os.altsep and os.altsep in tail):
+                raise ValueError(f"Entry kind and suffix must not contain path separators: {tail!r}")
+            pending.append((kind, content, metadata, tail))
+
+        entries: list[KnowledgeEntry] = []
+        records: list[dict] = []
+        for kind, content, metadata, tail in pending:
+            payload = {
+                "kind": kind,
+                "metadata": metadata,
+                "content": content,
+            }
+            data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+            recreated = False
+            while True:
+                filename = f"{timestamp}-{next(counter):06d}{tail}"
+                path = session_dir / filename
+                try:
+                    # O_EXCL: another process may be numbering the same session.
+                    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+                except FileExistsError:
+                    continue
+                except FileNotFoundError:
+                    if recreated:
+                        raise
+                    # The session directory was removed behind our back;
+                    # recreate it and recount its entries on demand.
+                    recreated = True
+                    session_dir = self._create_session_dir(session_id)
+                    for count_key in [key for key in self._kind_counts if key[0] == session_id]:
+                        del self._kind_counts[count_key]
+                    continue
+                try:
+                    os.write(fd, data)
+                finally:
+                    os.close(fd)
+                break
+            summary = metadata.get("summary") or content.partition("\n")[0]
+            records.append({"file": filename, "kind": kind, "summary": summary})
+            entries.append(
+                KnowledgeEntry(
+                    session_id=session_id,
+                    kind=kind,
+                    path=path,
+                    content=content,
+                    metadata=metadata,
+                )
+            )
+        if not entries:
+            return entries
+
+        with self._log_lock:
+            self._append_index(session_dir, records)
+            self._write_digest(session_dir, self._build_digest(session_id, _DIGEST_LIMIT))
+
+            self._invalidate_caches(session_id)
+            self._versions[session_id] = self._versions.get(session_id, 0) + 1
+            for entry in entries:
+                count_key = (session_id, entry.kind)
+                if count_key in self._kind_counts:
+                    self._kind_counts[count_key] += 1
 
-        payload = {
-            "kind": kind,
-            "metadata": metadata or {},
-            "content": content,
-        }
-        path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return entries
 
-        self._invalidate_caches(session_id)
+    def _create_session_dir(self, session_id: str) -> Path:
+        """Create the session directory and index, and remember it for later writes."""
 
+        session_dir = self._session_dir(session_id)
+        session_dir.mkdir(parents=True, exist_ok=True)
+        self._ensure_index(session_dir)
+        self._session_dirs[session_id] = session_dir
+        return session_dir
+
+    def _current_timestamp(self) -> str:
+        """Return the ``%Y%m%d-%H%M%S`` filename timestamp, formatting it at most once per second."""
+
+        now = int(time.time())
+        cached = self._timestamp
+        if cached[0] != now:
+            cached = self._timestamp = (now, time.strftime("%Y%m%d-%H%M%S", time.localtime(now)))
+        return cached[1]
+
+    def _load_payload(self, path: Path) -> Optional[dict]:
+        """Return the parsed payload for ``path``, reusing it while the file is unchanged."""
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        with self._file_cache_lock:
+            cached = self._file_cache.get(path)
+            if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                self._file_cache.move_to_end(path)
+                return cached[2]
+
+        try:
+            payload = self._read_payload(path, stat.st_size)
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+        with self._file_cache_lock:
+            self._file_cache[path] = (stat.st_mtime_ns, stat.st_size, payload)
+            self._file_cache.move_to_end(path)
+            if len(self._file_cache) > _FILE_CACHE_SIZE:
+                self._file_cache.popitem(last=False)
+        return payload
+
+    @staticmethod
+    def _read_payload(path: Path, size: int) -> dict:
+        if size < _MMAP_THRESHOLD_BYTES:
+            return orjson.loads(path.read_bytes())
+        with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            # The view must be released before the mapping closes.
+            with memoryview(mapped) as view:
+                return orjson.loads(view)
+
+    def _load_header(self, path: Path) -> Optional[tuple[str, str]]:
+        """Return ``(kind, summary)`` for ``path`` without decoding its content.
+
+        ``summary`` falls back to the first content line when the entry has no
+        ``metadata.summary``; that case requires a full parse.
+        """
+
+        cached = self._file_cache.get(path)
+        if cached is None:
+            try:
+                with path.open("rb") as handle:
+                    prefix = handle.read(_HEADER_READ_BYTES)
+            except FileNotFoundError:
+                return None
+            kind_match = _KIND_RE.search(prefix)
+            summary_match = _SUMMARY_RE.search(prefix)
+            if kind_match and summary_match:
+                try:
+                    return (
+                        orjson.loads(b'"' + kind_match.group(1) + b'"'),
+                        orjson.loads(b'"' + summary_match.group(1) + b'"'),
+                    )
+                except orjson.JSONDecodeError:
+                    pass
+
+        payload = self._load_payload(path)
+        if payload is None:
+            return None
+        summary = payload.get("metadata", {}).get("summary") or payload.get("content", "").partition("\n")[0]
+        return payload.get("kind", "unknown"), summary
+
+    @staticmethod
+    def _append_index(session_dir: Path, records: list[dict]) -> None:
+        data = b"".join(orjson.dumps(record) + b"\n" for record in records)
+        # A single O_APPEND write keeps concurrent appends from interleaving.
+        fd = os.open(session_dir / INDEX_FILENAME, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _write_digest(session_dir: Path, digest: str) -> None:
+        # Write under a per-thread temporary name and rename so readers never
+        # see a partial digest.
+        tmp_path = session_dir / f".{DIGEST_FILENAME}.{os.getpid()}.{threading.get_ident()}"
+        tmp_path.write_text(digest, encoding="utf-8")
+        os.replace(tmp_path, session_dir / DIGEST_FILENAME)
+
+    def _ensure_index(self, session_dir: Path) -> None:
+        """Create the session index, backfilling it from entries written before it existed."""
+
+        if (session_dir / INDEX_FILENAME).exists():
+            return
+        records = []
+        for path in sorted(session_dir.glob("*.md")):
+            header = self._load_header(path)
+            if header is not None:
+                records.append({"file": path.name, "kind": header[0], "summary": header[1]})
+        self._append_index(session_dir, records)
+
+    def _iter_index(self, session_id: str) -> Iterator[dict]:
+        """Yield index records newest first, reading the index backwards in chunks."""
+
+        session_dir = self._session_dirs.get(session_id)
+        if session_dir is None:
+            session_dir = self._session_dir(session_id)
+            if not session_dir.exists():
+                return
+            self._ensure_index(session_dir)
+            self._session_dirs[session_id] = session_dir
+
+        try:
+            handle = (session_dir / INDEX_FILENAME).open("rb")
+        except FileNotFoundError:
+            # Removed behind our back; re-check the session next time.
+            self._session_dirs.pop(session_id, None)
+            return
+        seen: set[str] = set()
+        with handle:
+            position = handle.seek(0, os.SEEK_END)
+            remainder = b""
+            while position > 0:
+                read_size = min(_INDEX_CHUNK_BYTES, position)
+                position -= read_size
+                handle.seek(position)
+                lines = (handle.read(read_size) + remainder).split(b"\n")
+                # The first piece may be a partial line; keep it for the next chunk.
+                remainder = lines.pop(0) if position > 0 else b""
+                for line in reversed(lines):
+                    if not line:
+                        continue
+                    try:
+                        record = orjson.loads(line)
+                    except orjson.JSONDecodeError:
+                        continue
+                    if record["file"] in seen:
+                        continue
+                    seen.add(record["file"])
+                    yield record
+
+    def _recent_headers(self, session_id: str, limit: int) -> list[tuple[str, str]]:
+        """Return ``(kind, summary)`` for the newest ``limit`` entries."""
+
+        return [
+            (record["kind"], record["summary"])
+            # ``limit`` can come from a model tool call; islice rejects negatives.
+            for record in itertools.islice(self._iter_index(session_id), max(limit, 0))
+        ]
+
+    @staticmethod
+    def _to_entry(session_id: str, path: Path, payload: dict) -> KnowledgeEntry:
         return KnowledgeEntry(
             session_id=session_id,
-            kind=kind,
+            kind=payload.get("kind", "unknown"),
             path=path,
-            content=content,
-            metadata=metadata or {},
+            content=payload.get("content", ""),
+            metadata=payload.get("metadata", {}),
         )
 
     def _invalidate_caches(self, session_id: str) -> None:
         self._digest_cache.pop(session_id, None)
-        keys_to_remove = [key for key in self._entries_cache if key[0] == session_id]
-        for key in keys_to_remove:
-            self._entries_cache.pop(key, None)
+        self._entries_cache.pop(session_id, None)
         self._session_cache.pop(session_id, None)
 
+    def version(self, session_id: str) -> int:
+        """Return a counter that increases every time this store logs to the session."""
+
+        return self._versions.get(session_id, 0)
+
     def entries(self, session_id: str, kind: Optional[str] = None, limit: int = 5) -> list[KnowledgeEntry]:
         """Return up to ``limit`` entries for the session (newest first)."""
 
-        cache_key = (session_id, kind, limit)
-        if cache_key in self._entries_cache:
-            return list(self._entries_cache[cache_key])
+        session_cache = self._entries_cache.setdefault(session_id, {})
+        cache_key = (kind, limit)
+        if cache_key in session_cache:
+            return list(session_cache[cache_key])
 
         session_dir = self._session_dir(session_id)
-        if not session_dir.exists():
-            return []
-
-        files = sorted(session_dir.glob("*.md"), reverse=True)
         results: list[KnowledgeEntry] = []
-        for path in files:
-            try:
-                payload = json.loads(path.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
+        for record in self._iter_index(session_id):
+            if kind and record["kind"] != kind:
                 continue
-            entry_kind = payload.get("kind", "unknown")
-            if kind and entry_kind != kind:
+            path = session_dir / record["file"]
+            payload = self._load_payload(path)
+            if payload is None:
                 continue
-            results.append(
-                KnowledgeEntry(
-                    session_id=session_id,
-                    kind=entry_kind,
-                    path=path,
-                    content=payload.get("content", ""),
-                    metadata=payload.get("metadata", {}),
-                )
-            )
+            results.append(self._to_entry(session_id, path, payload))
             if len(results) >= limit:
                 break
-        self._entries_cache[cache_key] = list(results)
+        session_cache[cache_key] = list(results)
         return results
 
-    def render_digest(self, session_id: str, limit: int = 3) -> str:
-        """Return a human-readable digest of recent learnings."""
+    def entries_multi(
+        self,
+        session_id: str,
+        limits: dict[Optional[str], int],
+        *,
+        newest_first: bool = True,
+    ) -> dict[Optional[str], list[KnowledgeEntry]]:
+        """Return the newest entries for several kinds in a single pass.
 
-        if session_id in self._digest_cache:
-            return self._digest_cache[session_id]
+        ``limits`` maps a kind (or ``None`` for any kind) to its maximum size.
+        With ``newest_first=False`` each bucket is returned in chronological order.
+        """
 
-        entries = self.entries(session_id, limit=limit)
-        if not entries:
+        buckets: dict[Optional[str], list[KnowledgeEntry]] = {kind: [] for kind in limits}
+        session_dir = self._session_dir(session_id)
+        pending = {kind for kind, limit in limits.items() if limit > 0}
+        for record in self._iter_index(session_id):
+            if not pending:
+                break
+            if None not in pending and record["kind"] not in pending:
+                continue
+            path = session_dir / record["file"]
+            payload = self._load_payload(path)
+            if payload is None:
+                continue
+            entry = self._to_entry(session_id, path, payload)
+            for kind in (None, entry.kind):
+                if kind not in pending:
+                    continue
+                bucket = buckets[kind]
+                bucket.append(entry)
+                if len(bucket) >= limits[kind]:
+                    pending.discard(kind)
+        if not newest_first:
+            for bucket in buckets.values():
+                bucket.reverse()
+        return buckets
+
+    def count(self, session_id: str, kind: str) -> int:
+        """Return how many entries of ``kind`` exist for the session."""
+
+        count_key = (session_id, kind)
+        if count_key not in self._kind_counts:
+            self._kind_counts[count_key] = sum(
+                1 for record in self._iter_index(session_id) if record["kind"] == kind
+            )
+        return self._kind_counts[count_key]
+
+    def _build_digest(self, session_id: str, limit: int) -> str:
+        headers = self._recent_headers(session_id, limit)
+        if not headers:
             return "No previous learnings recorded."
 
         lines: list[str] = ["Recent learnings:"]
-        for entry in entries:
-            summary = entry.metadata.get("summary") or entry.content.splitlines()[0].strip()
-            lines.append(f"- [{entry.kind}] {summary}")
-        digest = "\n".join(lines)
-        self._digest_cache[session_id] = digest
+        for kind, summary in headers:
+            lines.append(f"- [{kind}] {summary.strip()}")
+        return "\n".join(lines)
+
+    def render_digest(self, session_id: str, limit: int = _DIGEST_LIMIT) -> str:
+        """Return a human-readable digest of recent learnings.
+
+        The default digest is served from ``digest.txt``, which ``log()`` keeps
+        current; other limits are built from the index.
+        """
+
+        if limit != _DIGEST_LIMIT:
+            return self._build_digest(session_id, limit)
+
+        session_dir = self._session_dir(session_id)
+        digest_path = session_dir / DIGEST_FILENAME
+        try:
+            stat = digest_path.stat()
+        except FileNotFoundError:
+            digest = self._build_digest(session_id, limit)
+            if session_dir.exists():
+                # Sessions written before digest.txt existed get one on first read.
+                self._write_digest(session_dir, digest)
+            return digest
+
+        cached = self._digest_cache.get(session_id)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        digest = digest_path.read_text(encoding="utf-8")
+        self._digest_cache[session_id] = (stat.st_mtime_ns, stat.st_size, digest)
         return digest
 
-    def iter_all(self, session_id: str) -> Iterable[KnowledgeEntry]:
-        """Iterate over every entry for a session (oldest first)."""
+    def iter_all(self, session_id: str, kind: Optional[str] = None) -> Iterator[KnowledgeEntry]:
+        """Iterate over every entry for a session (oldest first).
+
+        When ``kind`` is given, files whose name encodes another kind are
+        skipped without being read.
+        """
 
         session_dir = self._session_dir(session_id)
         if not session_dir.exists():
-            return []
-        return (
-            KnowledgeEntry(
-                session_id=session_id,
-                kind=payload.get("kind", "unknown"),
-                path=path,
-                content=payload.get("content", ""),
-                metadata=payload.get("metadata", {}),
-            )
-            for path in sorted(session_dir.glob("*.md"))
-            for payload in [json.loads(path.read_text(encoding="utf-8"))]
-        )
+            return
+        for path in sorted(session_dir.glob("*.md")):
+            if kind is not None and not _filename_has_kind(path.name, kind):
+                continue
+            payload = self._load_payload(path)
+            if payload is None or (kind is not None and payload.get("kind") != kind):
+                continue
+            yield self._to_entry(session_id, path, payload)
 
     def list_sessions(self, limit: int = 20) -> list[SessionSnapshot]:
         """Return the most recently updated sessions with lightweight metadata."""
@@ -156,50 +509,65 @@ class KnowledgeStore:
         if not self.root.exists():
             return []
 
-        snapshots: list[SessionSnapshot] = []
-        for session_dir in self.root.iterdir():
-            if not session_dir.is_dir():
-                continue
+        with os.scandir(self.root) as root_entries:
+            session_entries = [entry for entry in root_entries if entry.is_dir()]
+        if not session_entries:
+            return []
 
-            session_id = session_dir.name
-            cached = self._session_cache.get(session_id)
-            if cached is not None:
-                snapshots.append(cached)
-                continue
-            files = sorted(session_dir.glob("*"), key=lambda p: p.stat().st_mtime, reverse=True)
-            if files:
-                updated_ts = files[0].stat().st_mtime
-            else:
-                updated_ts = session_dir.stat().st_mtime
-            updated_at = dt.datetime.fromtimestamp(updated_ts, tz=dt.timezone.utc)
-
-            digest = self.render_digest(session_id)
-
-            recent_entries = self.entries(session_id, limit=5)
-            recent = [
-                SessionSnapshotEntry(
-                    kind=entry.kind,
-                    summary=(entry.metadata.get("summary") or entry.content.splitlines()[0][:160]).strip(),
+        # Per-session work is dominated by filesystem reads, so overlap it on
+        # a small thread pool. Sessions are ranked by modification time first
+        # so digests/entries are only read for the sessions actually returned.
+        workers = min(_LIST_SESSIONS_MAX_WORKERS, len(session_entries))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            candidates = pool.map(self._session_updated_at, session_entries)
+            newest = heapq.nlargest(limit, (candidate for candidate in candidates if candidate is not None))
+            return list(
+                pool.map(
+                    lambda candidate: self._session_snapshot(candidate[1], candidate[0]),
+                    newest,
                 )
-                for entry in recent_entries
-            ]
-
-            snapshot = SessionSnapshot(
-                session_id=session_id,
-                updated_at=updated_at,
-                digest=digest,
-                recent=recent,
             )
-            self._session_cache[session_id] = snapshot
-            snapshots.append(snapshot)
 
-        snapshots.sort(key=lambda item: item.updated_at, reverse=True)
-        return snapshots[:limit]
+    def _session_updated_at(self, session_entry: os.DirEntry) -> Optional[tuple[int, str]]:
+        """Return ``(mtime_ns, session_id)``, using the newest entry file modification time.
+
+        Only ``*.md`` entries count: ``index.jsonl`` and ``digest.txt`` can be
+        (re)written by read paths and say nothing about session activity.
+        Returns ``None`` if the session directory has since been removed.
+        """
+
+        try:
+            with os.scandir(session_entry.path) as file_entries:
+                mtime_ns = max(
+                    (entry.stat().st_mtime_ns for entry in file_entries if entry.name.endswith(".md")),
+                    default=session_entry.stat().st_mtime_ns,
+                )
+        except FileNotFoundError:
+            return None
+        return mtime_ns, session_entry.name
+
+    def _session_snapshot(self, session_id: str, mtime_ns: int) -> SessionSnapshot:
+        cached = self._session_cache.get(session_id)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+        digest = self.render_digest(session_id)
+
+        headers = self._recent_headers(session_id, 5)
+
+        snapshot = SessionSnapshot(
+            session_id=session_id,
+            updated_at=dt.datetime.fromtimestamp(mtime_ns / 1e9, tz=dt.timezone.utc),
+            digest=digest,
+            recent_kinds=tuple(kind for kind, _ in headers),
+            recent_summaries=tuple(summary[:160].strip() for _, summary in headers),
+        )
+        self._session_cache[session_id] = (mtime_ns, snapshot)
+        return snapshot
 
 
 __all__ = [
     "KnowledgeStore",
     "KnowledgeEntry",
     "SessionSnapshot",
-    "SessionSnapshotEntry",
 ]
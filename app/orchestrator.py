@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from dataclasses import dataclass
 from typing import List, Optional
 
@@ -21,6 +22,26 @@ from .knowledge_store import KnowledgeStore
 from .session import PrototypeContext, SessionManager
 
 
+_PLAN_PROMPT_TEMPLATE = (
+    "You previously solved a similar task. Summarize the prior approach in a clear plan, "
+    "then ask the human if they would like to proceed with the same steps. "
+    "Do not execute the task yet.\n\n"
+    "Previous learnings:\n"
+    "{digest}\n\n"
+    "New request:\n"
+    "{question}"
+)
+
+# A plan that is never followed by a run (e.g. an API ``/plan`` call) must not
+# keep its prefetched augmentation around indefinitely.
+_PREFETCH_TTL_SECONDS = 300.0
+
+_TASK_PROMPT_TEMPLATE = "Session: {session_id}\n\n{digest}\n\nUser request:\n\n{question}{learn_mode_suffix}"
+_LEARN_MODE_SUFFIX = (
+    "\n\nLearn mode is ON. Offer the prior approach, ask whether to reuse it, and highlight differences before executing."
+)
+
+
 @dataclass(slots=True)
 class PlanPreview:
     plan_result: RunResult
@@ -52,33 +73,85 @@ class PrototypeOrchestrator:
         self.session_manager = session_manager
         self.knowledge_store = knowledge_store
         self.task_agent, self.ke_agent = build_agents(settings)
+        # The SDK only reads RunConfig, so every run shares one instance.
+        self._run_config = RunConfig(workflow_name=settings.workflow_name, tracing_disabled=True)
+        # Augmentations started by build_learn_mode_plan, keyed by session and
+        # tagged with the question and recap they were started for and the
+        # monotonic time they were started at.
+        self._augmentation_prefetch: dict[
+            str, tuple[str, SessionRecap, asyncio.Task[AugmentationResult], float]
+        ] = {}
+
+    def _prefetch_augmentation(self, session_id: str, question: str, recap: Optional[SessionRecap]) -> None:
+        self.discard_prefetch(session_id)
+        now = time.monotonic()
+        for stale_id in [
+            key for key, prefetched in self._augmentation_prefetch.items()
+            if now - prefetched[3] > _PREFETCH_TTL_SECONDS
+        ]:
+            self.discard_prefetch(stale_id)
+        if recap is None or not self.settings.has_api_key:
+            return
+        task = asyncio.create_task(
+            generate_augmented_prompt_async(question, recap, model=self.settings.default_model)
+        )
+        self._augmentation_prefetch[session_id] = (question, recap, task, now)
+
+    def _take_prefetch(
+        self, session_id: str, question: str, recap: SessionRecap
+    ) -> Optional[asyncio.Task[AugmentationResult]]:
+        prefetched = self._augmentation_prefetch.pop(session_id, None)
+        if prefetched is None:
+            return None
+        prefetched_question, prefetched_recap, task, started_at = prefetched
+        if (
+            prefetched_question == question
+            and prefetched_recap is recap
+            and time.monotonic() - started_at <= _PREFETCH_TTL_SECONDS
+        ):
+            return task
+        task.cancel()
+        return None
+
+    def discard_prefetch(self, session_id: str) -> None:
+        """Cancel the augmentation started by ``build_learn_mode_plan`` when no run will follow."""
+
+        prefetched = self._augmentation_prefetch.pop(session_id, None)
+        if prefetched is not None:
+            prefetched[2].cancel()
+
+    async def build_learn_mode_plan(
+        self,
+        session_id: str,
+        question: str,
+        *,
+        prefetch_augmentation: bool = False,
+    ) -> PlanPreview:
+        """Summarise the prior approach for the human to confirm.
 
+        With ``prefetch_augmentation`` the follow-up run's augmentation starts
+        now and overlaps the plan call. Only callers that will run the same
+        question or call ``discard_prefetch`` should opt in; a run with a
+        changed question pays for a second augmentation call.
+        """
 
-    async def build_learn_mode_plan(self, session_id: str, question: str) -> PlanPreview:
         session = self.session_manager.get(session_id)
         digest = self.knowledge_store.render_digest(session_id)
+        if prefetch_augmentation:
+            self._prefetch_augmentation(session_id, question, load_session_recap(self.knowledge_store, session_id))
         context = PrototypeContext(
             session_id=session_id,
             knowledge_store=self.knowledge_store,
             learn_mode=True,
             previous_learnings=[digest],
         )
-        plan_prompt = (
-            "You previously solved a similar task. Summarize the prior approach in a clear plan, "
-            "then ask the human if they would like to proceed with the same steps. "
-            "Do not execute the task yet.\n\n"
-            "Previous learnings:\n"
-            f"{digest}\n\n"
-            "New request:\n"
-            f"{question}"
-        )
-        run_config = RunConfig(workflow_name=self.settings.workflow_name, tracing_disabled=True)
+        plan_prompt = _PLAN_PROMPT_TEMPLATE.format(digest=digest, question=question)
         plan_result = await Runner.run(
             self.task_agent,
             plan_prompt,
             context=context,
             session=session,
-            run_config=run_config,
+            run_config=self._run_config,
         )
         return PlanPreview(plan_result=plan_result, digest=digest)
 
@@ -101,20 +174,31 @@ class PrototypeOrchestrator:
 
         if learn_mode:
             recap = load_session_recap(self.knowledge_store, session_id)
-            if self.settings.has_api_key:
-                augmentation_task = asyncio.create_task(
-                    generate_augmented_prompt_async(
-                        original_question,
-                        recap,
-                        model=self.settings.default_model,
-                    )
+            if recap is None:
+                # Nothing recorded yet, so there are no learnings to add.
+                augmentation_result = AugmentationResult(
+                    rewritten_prompt=original_question,
+                    justification=["Augmentation skipped: no prior session activity"],
+                    raw_text="",
                 )
+            elif self.settings.has_api_key:
+                augmentation_task = self._take_prefetch(session_id, original_question, recap)
+                if augmentation_task is None:
+                    augmentation_task = asyncio.create_task(
+                        generate_augmented_prompt_async(
+                            original_question,
+                            recap,
+                            model=self.settings.default_model,
+                        )
+                    )
             else:
                 augmentation_result = AugmentationResult(
                     rewritten_prompt=original_question,
                     justification=["Augmentation skipped: no API key configured"],
                     raw_text="",
                 )
+        else:
+            self.discard_prefetch(session_id)
 
         context = PrototypeContext(
             session_id=session_id,
@@ -128,19 +212,12 @@ class PrototypeOrchestrator:
         if augmentation_result is not None:
             question_for_agent = augmentation_result.rewritten_prompt
 
-        task_prompt_parts = [
-            f"Session: {session_id}",
-            digest,
-            "User request:",
-            question_for_agent,
-        ]
-        if learn_mode:
-            task_prompt_parts.append(
-                "Learn mode is ON. Offer the prior approach, ask whether to reuse it, and highlight differences before executing."
-            )
-        task_prompt = "\n\n".join(task_prompt_parts)
-
-        run_config = RunConfig(workflow_name=self.settings.workflow_name, tracing_disabled=True)
+        task_prompt = _TASK_PROMPT_TEMPLATE.format(
+            session_id=session_id,
+            digest=digest,
+            question=question_for_agent,
+            learn_mode_suffix=_LEARN_MODE_SUFFIX if learn_mode else "",
+        )
 
         with trace(
             self.settings.workflow_name,
@@ -151,36 +228,52 @@ class PrototypeOrchestrator:
                 task_prompt,
                 context=context,
                 session=session,
-                run_config=run_config,
+                run_config=self._run_config,
             )
 
             ke_result: Optional[RunResult] = None
             if synthesise_learning:
+                # Only the synthesised learning needs the KE agent; the request
+                # and task output are written while it runs. The request is not
+                # logged before the Task Agent finishes so its digest tool never
+                # lists the in-flight question as a prior learning.
+                task_output = str(task_result.final_output).strip()
+                log_turn_task = asyncio.create_task(
+                    asyncio.to_thread(
+                        self.knowledge_store.log_many,
+                        session_id,
+                        [
+                            ("user_actions", question_for_agent.strip(), {"tags": []}),
+                            ("agent_actions", task_output, {"summary": task_output.partition("\n")[0][:120]}),
+                        ],
+                    )
+                )
                 ke_prompt = (
                     "You are finishing a session."
-                    " Use your tools to (1) log the final prompt that went to the task agent,"
-                    " (2) log the task output, (3) write a distilled learning with actionable next steps." \
+                    " The final prompt and the task output have already been logged."
+                    " Use one log_batch call to write a distilled learning with actionable next steps." \
                     f"\n\nOriginal user request:\n{original_question}\n\nFinal prompt sent to task agent:\n{question_for_agent}\n\nTask agent output:\n{task_result.final_output}"
                 )
-                ke_context = PrototypeContext(
-                    session_id=session_id,
-                    knowledge_store=self.knowledge_store,
-                    learn_mode=learn_mode,
-                )
-                ke_result = await Runner.run(
-                    self.ke_agent,
-                    ke_prompt,
-                    context=ke_context,
-                    run_config=run_config,
-                )
+                # The KE agent gets the same context minus the digest, which
+                # only the Task Agent reads.
+                context.previous_learnings = []
+                try:
+                    ke_result = await Runner.run(
+                        self.ke_agent,
+                        ke_prompt,
+                        context=context,
+                        run_config=self._run_config,
+                    )
+                finally:
+                    await log_turn_task
 
         augmentation_preview: Optional[AugmentationPreview] = None
         augmentation = augmentation_result
         augmentation_preview: Optional[AugmentationPreview] = None
 
         if learn_mode and augmentation is not None:
-            suggestion_diff = diff_prompts(original_question, augmentation.rewritten_prompt)
-            final_diff = diff_prompts(original_question, question_for_agent)
+            # The task agent always receives the suggestion, so both diffs are the same.
+            suggestion_diff = final_diff = diff_prompts(original_question, question_for_agent)
             log_augmented_turn(
                 self.knowledge_store,
                 session_id,
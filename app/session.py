@@ -2,9 +2,10 @@
 from __future__ import annotations
 
 import asyncio
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Optional
 
 from agents import SQLiteSession
 
@@ -22,18 +23,31 @@ class PrototypeContext:
 
 
 class SessionManager:
-    """Lazily manages SQLite-backed sessions."""
+    """Lazily manages SQLite-backed sessions.
 
-    def __init__(self, db_path: Path) -> None:
+    At most ``max_sessions`` handles are cached; the least recently used one
+    is dropped when another session is opened past the limit. It is not
+    closed, since an in-flight run may still hold it; its connection closes
+    once the last reference is gone.
+    """
+
+    def __init__(self, db_path: Path, max_sessions: int = 256) -> None:
         self._db_path = db_path
-        self._sessions: Dict[str, SQLiteSession] = {}
+        self._max_sessions = max_sessions
+        self._sessions: OrderedDict[str, SQLiteSession] = OrderedDict()
 
     def get(self, session_id: str) -> SQLiteSession:
         """Return a cached SQLiteSession for the given session id."""
 
-        if session_id not in self._sessions:
-            self._sessions[session_id] = SQLiteSession(session_id, str(self._db_path))
-        return self._sessions[session_id]
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.move_to_end(session_id)
+            return session
+
+        if len(self._sessions) >= self._max_sessions:
+            self._sessions.popitem(last=False)
+        session = self._sessions[session_id] = SQLiteSession(session_id, str(self._db_path))
+        return session
 
     async def close_all(self) -> None:
         """Dispose of open sessions (best-effort)."""
@@ -1,11 +1,11 @@
 """Function tools shared by Task and Knowledge Exchange agents."""
 from __future__ import annotations
 
-from typing import Any, List, Optional
+from typing import Any, List, Literal, Optional
 
 from agents import RunContextWrapper, function_tool
+from pydantic import BaseModel
 
-from .knowledge_store import KnowledgeEntry
 from .session import PrototypeContext
 
 
@@ -16,58 +16,34 @@ def _require_context(wrapper: RunContextWrapper[PrototypeContext]) -> PrototypeC
     return context
 
 
-@function_tool
-def log_user_request(
-    wrapper: RunContextWrapper[PrototypeContext],
-    question: str,
-    tags: Optional[List[str]] = None,
-) -> str:
-    """Persist the latest user question in the knowledge store."""
-
-    context = _require_context(wrapper)
-    entry = context.knowledge_store.log(
-        session_id=context.session_id,
-        kind="user_actions",
-        content=question.strip(),
-        metadata={"tags": tags or []},
-    )
-    return f"Logged user request as {entry.path.name}"
-
+class LogBatchItem(BaseModel):
+    """One knowledge-store entry submitted through ``log_batch``."""
 
-@function_tool
-def log_agent_output(
-    wrapper: RunContextWrapper[PrototypeContext],
-    output: str,
-    summary: Optional[str] = None,
-) -> str:
-    """Persist the task agent's output."""
-
-    context = _require_context(wrapper)
-    entry = context.knowledge_store.log(
-        session_id=context.session_id,
-        kind="agent_actions",
-        content=output.strip(),
-        metadata={"summary": summary or output.strip().splitlines()[0][:120]},
-    )
-    return f"Logged agent output as {entry.path.name}"
+    kind: Literal["user_actions", "agent_actions", "synthesised_learnings"]
+    content: str
+    summary: Optional[str] = None
 
 
 @function_tool
-def log_synthesised_learning(
+def log_batch(
     wrapper: RunContextWrapper[PrototypeContext],
-    learning: str,
-    summary: Optional[str] = None,
+    items: List[LogBatchItem],
 ) -> str:
-    """Store distilled learnings for future sessions."""
+    """Persist several knowledge-store entries in a single call."""
 
     context = _require_context(wrapper)
-    entry = context.knowledge_store.log(
-        session_id=context.session_id,
-        kind="synthesised_learnings",
-        content=learning.strip(),
-        metadata={"summary": summary or learning.strip().splitlines()[0][:120]},
+    entries = context.knowledge_store.log_many(
+        context.session_id,
+        [
+            (
+                item.kind,
+                item.content.strip(),
+                {"summary": item.summary or item.content.strip().partition("\n")[0][:120]},
+            )
+            for item in items
+        ],
     )
-    return f"Logged synthesised learning as {entry.path.name}"
+    return "Logged " + ", ".join(entry.path.name for entry in entries) if entries else "Nothing to log"
 
 
 @function_tool
@@ -78,20 +54,16 @@ def get_recent_learnings(
     """Return a digest of recent entries for the session."""
 
     context = _require_context(wrapper)
-    entries: list[KnowledgeEntry] = context.knowledge_store.entries(context.session_id, limit=limit)
-    if not entries:
-        return "No previous learnings recorded."
-
-    lines = [f"Session digest for {context.session_id}:"]
-    for entry in entries:
-        summary = entry.metadata.get("summary") or entry.content.splitlines()[0][:160]
-        lines.append(f"- ({entry.kind}) {summary}")
-    return "\n".join(lines)
+    # Shares the store's digest (digest.txt for the default limit) instead of
+    # re-reading entries; only the heading differs.
+    digest = context.knowledge_store.render_digest(context.session_id, limit=limit)
+    _, separator, body = digest.partition("\n")
+    if not separator:
+        return digest
+    return f"Session digest for {context.session_id}:\n{body}"
 
 
 __all__ = [
-    "log_user_request",
-    "log_agent_output",
-    "log_synthesised_learning",
+    "log_batch",
     "get_recent_learnings",
 ]
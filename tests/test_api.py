@@ -9,7 +9,7 @@ from fastapi.testclient import TestClient
 
 import app.api as api
 from app.orchestrator import AugmentationPreview, PlanPreview, PrototypeRun
-from app.knowledge_store import SessionSnapshot, SessionSnapshotEntry
+from app.knowledge_store import SessionSnapshot
 
 
 def _build_usage() -> SimpleNamespace:
@@ -70,7 +70,8 @@ def client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
                 session_id="demo",
                 updated_at=dt.datetime(2025, 1, 1, tzinfo=dt.timezone.utc),
                 digest="Recent learnings:\n- (user_actions) Asked about taxes",
-                recent=[SessionSnapshotEntry(kind="user_actions", summary="Asked about taxes")],
+                recent_kinds=("user_actions",),
+                recent_summaries=("Asked about taxes",),
             )
         ],
     )
@@ -0,0 +1,134 @@
+import asyncio
+import difflib
+import gc
+import weakref
+from pathlib import Path
+from types import SimpleNamespace
+
+import orjson
+import pytest
+
+from app import augmentation
+from app.knowledge_store import KnowledgeStore
+
+
+class _FakeAsyncClient:
+    """Stands in for ``AsyncOpenAI``; like httpx, it only works on the loop it first ran on."""
+
+    instances: list["_FakeAsyncClient"] = []
+
+    def __init__(self) -> None:
+        self.loop = None
+        self.closed = False
+        self.responses = SimpleNamespace(create=self._create)
+        _FakeAsyncClient.instances.append(self)
+
+    async def _create(self, **request: object) -> SimpleNamespace:
+        loop = asyncio.get_running_loop()
+        if self.loop is None:
+            self.loop = loop
+        elif self.loop is not loop or self.closed:
+            raise RuntimeError("Event loop is closed")
+        payload = {"rewritten_prompt": "better", "justification": ["Reused prior learning"]}
+        return SimpleNamespace(output_text=orjson.dumps(payload).decode())
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def _clear_augmentation_cache() -> None:
+    augmentation._AUGMENTATION_CACHE.clear()
+
+
+def test_batch_wrapper_survives_repeated_calls(monkeypatch: pytest.MonkeyPatch) -> None:
+    _FakeAsyncClient.instances = []
+    monkeypatch.setattr(augmentation, "AsyncOpenAI", _FakeAsyncClient)
+
+    first = augmentation.generate_augmented_prompts([("one", None), ("two", None)], model="test")
+    augmentation._AUGMENTATION_CACHE.clear()
+    second = augmentation.generate_augmented_prompts([("one", None), ("two", None)], model="test")
+
+    assert [result.rewritten_prompt for result in first] == ["better", "better"]
+    assert [result.rewritten_prompt for result in second] == ["better", "better"]
+    assert len(_FakeAsyncClient.instances) == 2
+    assert all(client.closed for client in _FakeAsyncClient.instances)
+
+
+def test_diff_prompts_matches_plain_unified_diff() -> None:
+    original = "\n".join("x d x d x b d d b d".split())
+    rewritten = "\n".join("x d y c x d x b d d b d".split())
+
+    diff = augmentation.diff_prompts(original, rewritten)
+
+    expected = list(
+        difflib.unified_diff(
+            original.splitlines(), rewritten.splitlines(), fromfile="original", tofile="augmented", lineterm=""
+        )
+    )[2:]
+    assert diff == "\n".join(expected)
+    assert [line for line in diff.splitlines() if line[:1] in "+-"] == ["+y", "+c"]
+
+
+def test_diff_prompts_is_empty_for_identical_prompts() -> None:
+    assert augmentation.diff_prompts("Same\n\nprompt", "Same\n\nprompt") == ""
+
+
+class _FakeClient:
+    def __init__(self, *outputs: str) -> None:
+        self.outputs = list(outputs)
+        self.calls = 0
+        self.responses = SimpleNamespace(create=self._create)
+
+    def _create(self, **request: object) -> SimpleNamespace:
+        self.calls += 1
+        return SimpleNamespace(output_text=self.outputs.pop(0))
+
+
+def _rewrite(prompt: str) -> str:
+    return orjson.dumps({"rewritten_prompt": prompt, "justification": ["Reused prior learning"]}).decode()
+
+
+def test_augmentation_cache_reuses_rewrites_across_whitespace_only(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _FakeClient(_rewrite("better getX"), _rewrite("better getx"))
+    monkeypatch.setattr(augmentation, "_get_client", lambda: client)
+
+    first = augmentation.generate_augmented_prompt("What does  `getX` do", None, model="test")
+    second = augmentation.generate_augmented_prompt("What does `getX` do\n", None, model="test")
+    other_case = augmentation.generate_augmented_prompt("What does `getx` do", None, model="test")
+
+    assert first.rewritten_prompt == second.rewritten_prompt == "better getX"
+    assert other_case.rewritten_prompt == "better getx"
+    assert client.calls == 2
+
+
+def test_augmentation_cache_skips_unparseable_responses(monkeypatch: pytest.MonkeyPatch) -> None:
+    client = _FakeClient("not json", '{"justification": []}', _rewrite("better"))
+    monkeypatch.setattr(augmentation, "_get_client", lambda: client)
+
+    results = [augmentation.generate_augmented_prompt("Question", None, model="test") for _ in range(4)]
+
+    assert [result.justification[0] for result in results[:2]] == [
+        "Model response was not valid JSON",
+        "Model did not provide a rewritten prompt",
+    ]
+    assert [result.rewritten_prompt for result in results[2:]] == ["better", "better"]
+    assert client.calls == 3
+
+
+def test_session_recap_is_cached_per_store_version(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    store.log("session", "user_actions", "First question")
+
+    recap = augmentation.load_session_recap(store, "session")
+    assert augmentation.load_session_recap(store, "session") is recap
+
+    store.log("session", "user_actions", "Second question")
+    refreshed = augmentation.load_session_recap(store, "session")
+    assert refreshed is not recap
+    assert refreshed.recent_user_queries == ["First question", "Second question"]
+
+    store_ref = weakref.ref(store)
+    del store, recap, refreshed
+    gc.collect()
+    assert store_ref() is None
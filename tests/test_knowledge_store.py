@@ -1,5 +1,10 @@
+import os
+import shutil
 from pathlib import Path
 
+import pytest
+
+from app import knowledge_store
 from app.knowledge_store import KnowledgeStore
 
 
@@ -10,3 +15,257 @@ def test_log_and_retrieve(tmp_path: Path) -> None:
     assert "user_actions" in digest
     entries = store.entries("session")
     assert entries and entries[0].kind == "user_actions"
+
+
+def test_count_tracks_new_entries(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    store.log("session", "user_actions", "First question")
+    assert store.count("session", "user_actions") == 1
+    assert store.count("session", "augmented_turns") == 0
+
+    store.log("session", "augmented_turns", "Turn 1", metadata={"suffix": "a"})
+    store.log("session", "augmented_turns", "Turn 2", metadata={"suffix": "b"})
+    assert store.count("session", "augmented_turns") == 2
+
+
+def test_entries_multi_matches_individual_queries(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    for index in range(4):
+        store.log("session", "user_actions", f"Question {index}", metadata={"suffix": str(index)})
+        store.log("session", "agent_actions", f"Answer {index}", metadata={"suffix": str(index)})
+
+    buckets = store.entries_multi("session", {"user_actions": 2, None: 3, "missing": 1})
+
+    assert buckets["user_actions"] == store.entries("session", kind="user_actions", limit=2)
+    assert buckets[None] == store.entries("session", limit=3)
+    assert buckets["missing"] == []
+
+    chronological = store.entries_multi("session", {"user_actions": 2}, newest_first=False)
+    assert chronological["user_actions"] == list(reversed(buckets["user_actions"]))
+
+
+def test_list_sessions_orders_by_recency_and_limits(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    for index, session_id in enumerate(["older", "middle", "newest"]):
+        entry = store.log(session_id, "user_actions", f"Question {session_id}")
+        os.utime(entry.path, (1_700_000_000 + index, 1_700_000_000 + index))
+
+    snapshots = store.list_sessions(limit=2)
+
+    assert [snapshot.session_id for snapshot in snapshots] == ["newest", "middle"]
+    assert snapshots[0].recent_summaries[0] == "Question newest"
+
+
+def test_payload_cache_picks_up_rewritten_files(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    entry = store.log("session", "user_actions", "Original question")
+    assert store.entries("session")[0].content == "Original question"
+
+    entry.path.write_text(
+        '{"kind": "user_actions", "metadata": {}, "content": "Edited question, longer"}',
+        encoding="utf-8",
+    )
+    store._invalidate_caches("session")  # noqa: SLF001 - simulate an external edit
+    assert store.entries("session")[0].content == "Edited question, longer"
+
+
+def test_render_digest_reads_summary_or_first_line(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    store.log("session", "user_actions", "Plain question\nwith details", metadata={"suffix": "a"})
+    store.log(
+        "session",
+        "agent_actions",
+        "x" * 10_000,
+        metadata={"summary": 'Answered "quoted" topic', "suffix": "b"},
+    )
+
+    digest = store.render_digest("session")
+
+    assert '- [agent_actions] Answered "quoted" topic' in digest
+    assert "- [user_actions] Plain question" in digest
+    assert (tmp_path / "session" / knowledge_store.DIGEST_FILENAME).read_text(encoding="utf-8") == digest
+    assert store.render_digest("session", limit=1) == 'Recent learnings:\n- [agent_actions] Answered "quoted" topic'
+
+
+def test_index_tail_spans_chunks_and_backfills_legacy_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(knowledge_store, "_INDEX_CHUNK_BYTES", 64)
+    legacy_dir = tmp_path / "session"
+    legacy_dir.mkdir()
+    (legacy_dir / "20240101-000000-user_actions.md").write_text(
+        '{"kind": "user_actions", "metadata": {}, "content": "Legacy question"}',
+        encoding="utf-8",
+    )
+
+    store = KnowledgeStore(tmp_path)
+    for index in range(12):
+        store.log("session", "agent_actions", f"Answer {index}", metadata={"suffix": f"{index:02d}"})
+
+    assert [entry.content for entry in store.entries("session", limit=3)] == [
+        "Answer 11",
+        "Answer 10",
+        "Answer 9",
+    ]
+    assert store.entries("session", kind="user_actions")[0].content == "Legacy question"
+    assert store.count("session", "agent_actions") == 12
+
+
+def test_iter_all_filters_kind_by_filename(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    store = KnowledgeStore(tmp_path)
+    store.log("session", "user_actions", "Question", metadata={"suffix": "q"})
+    store.log("session", "agent_actions", "Answer", metadata={"suffix": "a"})
+
+    loaded: list[str] = []
+    original = KnowledgeStore._load_payload
+
+    def tracking_load(self, path):
+        loaded.append(path.name)
+        return original(self, path)
+
+    monkeypatch.setattr(KnowledgeStore, "_load_payload", tracking_load)
+    entries = list(store.iter_all("session", kind="agent_actions"))
+    assert [entry.content for entry in entries] == ["Answer"]
+    assert loaded == [entries[0].path.name]
+
+
+def test_log_many_writes_entries_in_one_batch(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    assert store.count("session", "agent_actions") == 0
+
+    entries = store.log_many(
+        "session",
+        [
+            ("agent_actions", "Answer", {"summary": "Answered"}),
+            ("synthesised_learnings", "Learning\nDetails", None),
+        ],
+    )
+
+    assert [entry.kind for entry in entries] == ["agent_actions", "synthesised_learnings"]
+    assert store.version("session") == 1
+    assert store.count("session", "agent_actions") == 1
+    assert store.render_digest("session") == (
+        "Recent learnings:\n- [synthesised_learnings] Learning\n- [agent_actions] Answered"
+    )
+
+
+def test_same_second_entries_get_distinct_files(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    first = store.log("session", "user_actions", "First")
+    second = store.log("session", "user_actions", "Second")
+
+    assert first.path != second.path
+    assert [entry.content for entry in store.iter_all("session", kind="user_actions")] == ["First", "Second"]
+    assert store.count("session", "user_actions") == 2
+
+
+def test_log_skips_names_taken_by_other_writers(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    first = store.log("session", "user_actions", "First")
+    taken = first.path.with_name(first.path.name.replace("-000000-", "-000001-"))
+    taken.write_text("{}", encoding="utf-8")
+
+    second = store.log("session", "user_actions", "Second")
+
+    assert second.path not in (first.path, taken)
+    assert taken.read_text(encoding="utf-8") == "{}"
+
+
+def test_iter_all_parses_large_entries(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    content = "é" * knowledge_store._MMAP_THRESHOLD_BYTES
+    store.log("session", "agent_actions", content)
+
+    assert [entry.content for entry in store.iter_all("session")] == [content]
+
+
+def test_list_sessions_sees_entries_from_other_stores(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    store.log("session", "user_actions", "First question")
+    assert store.list_sessions()[0].recent_summaries == ("First question",)
+
+    KnowledgeStore(tmp_path).log("session", "user_actions", "Second question")
+
+    assert store.list_sessions()[0].recent_summaries == ("Second question", "First question")
+
+
+def test_list_sessions_includes_sessions_created_by_this_store(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    store.log("first", "user_actions", "Question")
+    assert [snapshot.session_id for snapshot in store.list_sessions()] == ["first"]
+
+    store.log("second", "user_actions", "Question")
+
+    assert {snapshot.session_id for snapshot in store.list_sessions()} == {"first", "second"}
+
+
+def test_list_sessions_ignores_derived_files_written_on_read(tmp_path: Path) -> None:
+    for session_id, timestamp in (("older", 1_577_836_800), ("newer", 1_672_531_200)):
+        legacy_dir = tmp_path / session_id
+        legacy_dir.mkdir()
+        entry_path = legacy_dir / "20200101-000000-user_actions.md"
+        entry_path.write_text(
+            '{"kind": "user_actions", "metadata": {}, "content": "Legacy question"}',
+            encoding="utf-8",
+        )
+        os.utime(entry_path, (timestamp, timestamp))
+
+    first = KnowledgeStore(tmp_path).list_sessions()
+    assert (tmp_path / "older" / knowledge_store.DIGEST_FILENAME).exists()
+    second = KnowledgeStore(tmp_path).list_sessions()
+
+    for snapshots in (first, second):
+        assert [snapshot.session_id for snapshot in snapshots] == ["newer", "older"]
+        assert [snapshot.updated_at.year for snapshot in snapshots] == [2023, 2020]
+
+
+def test_log_recreates_removed_session_directory(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    first = store.log("session", "user_actions", "First question")
+    assert store.count("session", "user_actions") == 1
+    shutil.rmtree(first.path.parent)
+
+    second = store.log("session", "user_actions", "Second question")
+
+    assert second.path.exists()
+    assert [entry.content for entry in store.entries("session")] == ["Second question"]
+    assert store.count("session", "user_actions") == 1
+
+
+@pytest.mark.parametrize(
+    ("kind", "metadata"),
+    [("notes/x", None), ("user_actions", {"suffix": "a/b"})],
+)
+def test_log_rejects_path_separators_in_filename_parts(tmp_path: Path, kind: str, metadata: dict) -> None:
+    store = KnowledgeStore(tmp_path)
+
+    with pytest.raises(ValueError):
+        store.log("session", kind, "hi", metadata=metadata)
+
+    assert store.entries("session") == []
+
+
+def test_log_many_rejects_whole_batch_with_bad_filename_part(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+
+    with pytest.raises(ValueError):
+        store.log_many("session", [("user_actions", "ok", None), ("notes/x", "bad", None)])
+
+    assert list((tmp_path / "session").glob("*.md")) == []
+
+
+def test_render_digest_treats_negative_limit_as_empty(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    store.log("session", "user_actions", "Question")
+
+    assert store.render_digest("session", limit=-1) == "No previous learnings recorded."
+
+
+def test_list_sessions_sees_sessions_created_by_other_stores(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    store.log("first", "user_actions", "Question")
+    assert [snapshot.session_id for snapshot in store.list_sessions()] == ["first"]
+
+    KnowledgeStore(tmp_path).log("second", "user_actions", "Question")
+
+    assert {snapshot.session_id for snapshot in store.list_sessions()} == {"first", "second"}
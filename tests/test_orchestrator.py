@@ -0,0 +1,104 @@
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from app import orchestrator
+from app.augmentation import AugmentationResult
+from app.config import PrototypeSettings
+from app.knowledge_store import KnowledgeStore
+from app.session import SessionManager
+
+
+@pytest.fixture()
+def augment_calls(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    calls: list[str] = []
+
+    async def fake_augment(question, recap, *, model):  # noqa: ARG001 - parity with real impl
+        calls.append(question)
+        await asyncio.sleep(0.01)
+        return AugmentationResult(f"better {question}", ["Reused prior learning"], raw_text="{}")
+
+    async def fake_run(agent, prompt, **kwargs):  # noqa: ARG001
+        await asyncio.sleep(0)  # let a prefetched augmentation start
+        return SimpleNamespace(final_output="Task agent answer", output_guardrail_results=[], context_wrapper=None)
+
+    monkeypatch.setattr(orchestrator, "generate_augmented_prompt_async", fake_augment)
+    monkeypatch.setattr(orchestrator.Runner, "run", fake_run)
+    return calls
+
+
+@pytest.fixture()
+def prototype(tmp_path: Path) -> orchestrator.PrototypeOrchestrator:
+    settings = PrototypeSettings(
+        openai_api_key="test-key",
+        default_model="test-model",
+        workflow_name="test",
+        data_root=tmp_path,
+        session_db=tmp_path / "sessions.sqlite",
+    )
+    store = KnowledgeStore(tmp_path)
+    store.log("session", "user_actions", "Earlier question")
+    return orchestrator.PrototypeOrchestrator(settings, SessionManager(settings.session_db), store)
+
+
+def _plan_then_run(
+    prototype: orchestrator.PrototypeOrchestrator, planned: str, asked: str, **plan_kwargs: object
+) -> orchestrator.PrototypeRun:
+    async def scenario() -> orchestrator.PrototypeRun:
+        try:
+            await prototype.build_learn_mode_plan("session", planned, **plan_kwargs)
+            return await prototype.run_turn("session", asked, learn_mode=True, synthesise_learning=False)
+        finally:
+            await prototype.session_manager.close_all()
+
+    return asyncio.run(scenario())
+
+
+def test_plan_does_not_prefetch_by_default(prototype, augment_calls) -> None:
+    run = _plan_then_run(prototype, "Question", "Question")
+
+    assert run.augmentation.final_prompt == "better Question"
+    assert augment_calls == ["Question"]
+    assert prototype._augmentation_prefetch == {}
+
+
+def test_run_adopts_matching_prefetch(prototype, augment_calls) -> None:
+    run = _plan_then_run(prototype, "Question", "Question", prefetch_augmentation=True)
+
+    assert run.augmentation.final_prompt == "better Question"
+    assert augment_calls == ["Question"]
+    assert prototype._augmentation_prefetch == {}
+
+
+def test_run_replaces_prefetch_for_changed_question(prototype, augment_calls) -> None:
+    run = _plan_then_run(prototype, "Question", "Question plus guidance", prefetch_augmentation=True)
+
+    assert run.augmentation.final_prompt == "better Question plus guidance"
+    assert augment_calls == ["Question", "Question plus guidance"]
+
+
+def test_run_ignores_expired_prefetch(prototype, augment_calls, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(orchestrator, "_PREFETCH_TTL_SECONDS", -1.0)
+
+    run = _plan_then_run(prototype, "Question", "Question", prefetch_augmentation=True)
+
+    assert run.augmentation.final_prompt == "better Question"
+    assert augment_calls == ["Question", "Question"]
+    assert prototype._augmentation_prefetch == {}
+
+
+def test_discard_prefetch_cancels_pending_augmentation(prototype, augment_calls) -> None:
+    async def scenario() -> asyncio.Task:
+        try:
+            await prototype.build_learn_mode_plan("session", "Question", prefetch_augmentation=True)
+            task = prototype._augmentation_prefetch["session"][2]
+            prototype.discard_prefetch("session")
+            await asyncio.gather(task, return_exceptions=True)
+            return task
+        finally:
+            await prototype.session_manager.close_all()
+
+    assert asyncio.run(scenario()).cancelled()
+    assert prototype._augmentation_prefetch == {}
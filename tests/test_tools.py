@@ -0,0 +1,34 @@
+import asyncio
+from pathlib import Path
+
+import orjson
+from agents.tool_context import ToolContext
+
+from app.knowledge_store import KnowledgeStore
+from app.session import PrototypeContext
+from app.tools import log_batch
+
+
+def test_log_batch_writes_every_item(tmp_path: Path) -> None:
+    store = KnowledgeStore(tmp_path)
+    context = PrototypeContext(session_id="session", knowledge_store=store)
+    arguments = orjson.dumps(
+        {
+            "items": [
+                {"kind": "synthesised_learnings", "content": " Learned X\nNext steps ", "summary": None},
+                {"kind": "agent_actions", "content": "Answer", "summary": "Answered"},
+            ]
+        }
+    ).decode()
+    tool_context = ToolContext(
+        context=context, tool_name=log_batch.name, tool_call_id="call", tool_arguments=arguments
+    )
+
+    reply = asyncio.run(log_batch.on_invoke_tool(tool_context, arguments))
+
+    entries = list(store.iter_all("session"))
+    assert [(entry.kind, entry.content, entry.metadata["summary"]) for entry in entries] == [
+        ("synthesised_learnings", "Learned X\nNext steps", "Learned X"),
+        ("agent_actions", "Answer", "Answered"),
+    ]
+    assert reply == "Logged " + ", ".join(entry.path.name for entry in entries)